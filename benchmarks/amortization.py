@@ -0,0 +1,79 @@
+"""Compare the vectorized amortization engine with the original per-month loop.
+
+Run from the project root:
+
+    python -m benchmarks.amortization
+"""
+import random
+import time
+
+import numpy as np
+
+from app import amortization_schedule_batch, calculate_monthly_payment
+
+CHUNK_SIZE = 5000  # loans per vectorized call; keeps each N x M array around 15MB
+
+
+def loop_schedule(principal, annual_rate, months):
+    # The pre-vectorization implementation of generate_amortization_schedule
+    monthly_rate = annual_rate / 100 / 12
+    monthly_payment = calculate_monthly_payment(principal, annual_rate, months)
+    balance = principal
+    schedule = []
+
+    for month in range(1, months + 1):
+        interest_payment = balance * monthly_rate
+        principal_payment = monthly_payment - interest_payment
+        balance -= principal_payment
+
+        schedule.append({
+            'month': month,
+            'payment': monthly_payment,
+            'principal': principal_payment,
+            'interest': interest_payment,
+            'balance': max(0, balance)
+        })
+
+    return schedule
+
+
+def make_portfolio(n_loans, seed=42):
+    rng = random.Random(seed)
+    principals = [round(rng.uniform(10000, 5000000), 2) for _ in range(n_loans)]
+    rates = [round(rng.uniform(0, 18), 2) for _ in range(n_loans)]
+    terms = [rng.choice([12, 24, 36, 60, 120, 240, 360]) for _ in range(n_loans)]
+    return principals, rates, terms
+
+
+def run_loop(principals, rates, terms):
+    start = time.perf_counter()
+    for principal, rate, term in zip(principals, rates, terms):
+        loop_schedule(principal, rate, term)
+    return time.perf_counter() - start
+
+
+def run_vectorized(principals, rates, terms):
+    principals = np.asarray(principals)
+    rates = np.asarray(rates)
+    terms = np.asarray(terms)
+    start = time.perf_counter()
+    for offset in range(0, len(principals), CHUNK_SIZE):
+        window = slice(offset, offset + CHUNK_SIZE)
+        amortization_schedule_batch(principals[window], rates[window], terms[window])
+    return time.perf_counter() - start
+
+
+def main():
+    print(f"{'loans':>8} {'months':>10} {'loop (s)':>10} {'numpy (s)':>10} {'speedup':>8}")
+    for n_loans in (1, 1000, 100000):
+        principals, rates, terms = make_portfolio(n_loans)
+        loop_time = run_loop(principals, rates, terms)
+        vector_time = run_vectorized(principals, rates, terms)
+        print(
+            f"{n_loans:>8} {sum(terms):>10} {loop_time:>10.4f} {vector_time:>10.4f} "
+            f"{loop_time / vector_time if vector_time else float('inf'):>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
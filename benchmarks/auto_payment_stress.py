@@ -0,0 +1,114 @@
+"""Run the auto-payment scheduler from several processes at once and check nothing is paid twice.
+
+Run from the project root:
+
+    python -m benchmarks.auto_payment_stress --loans 20000 --processes 4
+
+Seeds a portfolio, sets up an automatic payment on every payable loan with
+installments left, then starts the scheduler in every process at the same
+moment. Each mandate must be collected exactly once, every lease must be
+released and the ledger must still balance. Prints throughput and the lag
+between due dates and collection. Exits non-zero if any check fails.
+"""
+import argparse
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--db", default=os.path.join(tempfile.gettempdir(), "auto_payment_stress.db"),
+                        help="SQLite file to create (ignored when DATABASE_URL is set).")
+    parser.add_argument("--loans", type=int, default=20000, help="Loans to seed.")
+    parser.add_argument("--processes", type=int, default=4, help="Schedulers started at once.")
+    parser.add_argument("--workers", type=int, default=None, help="Threads per scheduler (default AUTO_PAYMENT_WORKERS).")
+    parser.add_argument("--seed", type=int, default=11)
+    return parser.parse_args()
+
+
+def run_scheduler(as_of, workers, start_at):
+    import app as app_module
+
+    with app_module.app.app_context():
+        time.sleep(max(0, start_at - time.time()))
+        return app_module.process_auto_payments(as_of=as_of, workers=workers)
+
+
+def main():
+    args = parse_args()
+    if "DATABASE_URL" not in os.environ:
+        for path in (args.db, args.db + "-wal", args.db + "-shm"):
+            if os.path.exists(path):
+                os.remove(path)
+        os.environ["DATABASE_URL"] = f"sqlite:///{os.path.abspath(args.db)}"
+    os.environ.setdefault("EMAIL_DISPATCHER_ENABLED", "false")
+
+    import app as app_module
+    from app import AutoPayment, Loan, PaymentSubmission, db
+
+    rng = random.Random(args.seed)
+    as_of = datetime.utcnow() + timedelta(days=31)
+    with app_module.app.app_context():
+        app_module.upgrade_database()
+        app_module.seed_synthetic_data(customers=max(args.loans // 5, 1), loans=args.loans, seed=args.seed)
+        loan_ids = [loan_id for (loan_id,) in db.session.query(Loan.id).filter(
+            Loan.status.in_(app_module.PAYABLE_LOAN_STATUSES))]
+        next_dates = app_module.next_installment_dates(loan_ids)
+        db.session.execute(db.insert(AutoPayment), [
+            {"loan_id": loan_id, "payment_method": rng.choice(app_module.AUTO_PAYMENT_METHODS),
+             "amount_type": rng.choice(["full", "full", "minimum"]), "status": "active",
+             "next_payment_date": due, "attempts": 0, "next_attempt_at": datetime.utcnow()}
+            for loan_id, due in next_dates.items()
+        ])
+        db.session.commit()
+        due = db.session.query(db.func.count(AutoPayment.id)).filter(AutoPayment.next_payment_date <= as_of).scalar()
+    print(f"{len(next_dates)} mandates, {due} due by {as_of:%Y-%m-%d}; "
+          f"starting {args.processes} schedulers")
+
+    start = time.perf_counter()
+    start_at = time.time() + 2  # let every process import the app first
+    with multiprocessing.get_context("spawn").Pool(args.processes) as pool:
+        summaries = pool.starmap(run_scheduler, [(as_of, args.workers, start_at)] * args.processes)
+    elapsed = time.perf_counter() - start - 2
+
+    for i, summary in enumerate(summaries):
+        print(f"  scheduler {i}: " + ", ".join(f"{key} {value}" for key, value in summary.items()))
+    totals = {key: sum(summary[key] for summary in summaries)
+              for key in ("posted", "duplicate", "skipped", "failed", "suspended", "completed")}
+    print(f"{sum(totals.values())} mandates processed in {elapsed:.1f}s "
+          f"({sum(totals.values()) / elapsed:,.0f}/s): " + ", ".join(f"{v} {k}" for k, v in totals.items()))
+
+    failures = []
+    with app_module.app.app_context():
+        keys = [key for (key,) in db.session.query(PaymentSubmission.idempotency_key).filter(
+            PaymentSubmission.idempotency_key.like("auto:%"))]
+        submissions = len(keys)
+        # auto:<mandate>:<installment date>; one payment per mandate in a single run
+        distinct_mandates = len({key.split(":")[1] for key in keys})
+        if submissions != totals["posted"]:
+            failures.append(f"{submissions} auto payments recorded, schedulers report {totals['posted']} posted")
+        if distinct_mandates != submissions:
+            failures.append(f"{submissions - distinct_mandates} mandates were collected more than once")
+        if sum(totals.values()) != due:
+            failures.append(f"{sum(totals.values())} mandates processed, {due} were due")
+        claimed = db.session.query(db.func.count(AutoPayment.id)).filter(AutoPayment.claimed_by.isnot(None)).scalar()
+        if claimed:
+            failures.append(f"{claimed} mandates still hold a lease")
+        ledger = app_module.verify_ledger()
+        if ledger["mismatched"] or ledger["unbalanced"]:
+            failures.append(f"ledger: {ledger['mismatched']} mismatched loans, {ledger['unbalanced']} unbalanced entries")
+
+    for failure in failures:
+        print(f"FAIL {failure}")
+    if failures:
+        sys.exit(1)
+    print("OK: every due mandate collected exactly once across schedulers.")
+
+
+if __name__ == "__main__":
+    main()
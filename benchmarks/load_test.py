@@ -0,0 +1,221 @@
+"""Seed a synthetic portfolio and measure latency of the core loan workflows.
+
+Run from the project root:
+
+    python -m benchmarks.load_test --output results.json
+    python -m benchmarks.load_test --mode http --concurrency 16
+
+The portfolio is written to its own SQLite file (--db) and reused on later
+runs unless --reseed is given. Results are printed and optionally written
+as JSON so runs can be compared across commits.
+"""
+import argparse
+import http.client
+import json
+import logging
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from urllib.parse import urlencode
+
+import numpy as np
+
+ADMIN_USERNAME = "admin"
+ADMIN_PASSWORD = "admin123"
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--db", default=os.path.join(tempfile.gettempdir(), "loan_benchmark.db"))
+    parser.add_argument("--customers", type=int, default=10000)
+    parser.add_argument("--loans", type=int, default=100000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--reseed", action="store_true", help="Drop and recreate the benchmark database.")
+    parser.add_argument("--mode", choices=["test-client", "http"], default="test-client")
+    parser.add_argument("--requests", type=int, default=200, help="Requests per scenario.")
+    parser.add_argument("--concurrency", type=int, default=8, help="Worker threads in http mode.")
+    parser.add_argument("--output", help="Write results as JSON to this file.")
+    return parser.parse_args()
+
+
+def seed_portfolio(app_module, n_customers, n_loans, seed):
+    from seed_admin import ensure_admin_user
+
+    ensure_admin_user(username=ADMIN_USERNAME, email="admin@example.com", password=ADMIN_PASSWORD)
+    with app_module.app.app_context():
+        return app_module.seed_synthetic_data(n_customers, n_loans, seed)
+
+
+def pick_targets(app_module, count, seed):
+    """Choose loan ids for each scenario up front so timings exclude lookups."""
+    rng = random.Random(seed)
+    with app_module.app.app_context():
+        Loan = app_module.Loan
+        query = app_module.db.session.query
+        max_id = query(app_module.db.func.max(Loan.id)).scalar() or 0
+        pending = [row.id for row in query(Loan.id).filter(Loan.status == "pending").limit(count)]
+        payable = [row.id for row in query(Loan.id).filter(Loan.status.in_(["approved", "active"])).limit(count * 5)]
+    return {
+        "loan_ids": [rng.randint(1, max_id) for _ in range(count)] if max_id else [],
+        "pending_ids": pending,
+        "payable_ids": rng.sample(payable, min(count, len(payable))),
+    }
+
+
+def scenarios(targets, rng):
+    """(name, method, path, form/json body) tuples for every workflow measured."""
+    calc = lambda: {"principal": rng.randint(10000, 5000000), "rate": round(rng.uniform(5, 18), 2),
+                    "term": rng.choice([12, 60, 120, 240, 360])}
+    return {
+        "login": lambda i: ("POST", "/login", {"form": {"username": ADMIN_USERNAME, "password": ADMIN_PASSWORD}}),
+        "loans": lambda i: ("GET", "/loans", {}),
+        "loan_detail": lambda i: ("GET", f"/loan/{targets['loan_ids'][i % len(targets['loan_ids'])]}", {}),
+        "make_payment": lambda i: ("POST", f"/make-payment/{targets['payable_ids'][i % len(targets['payable_ids'])]}",
+                                   {"form": {"amount": "1", "payment_method": "online"}}),
+        "approve_loan": lambda i: ("POST", f"/api/loan/{targets['pending_ids'][i]}/approve", {"json": {}}),
+        "loan_calculator": lambda i: ("POST", "/api/loan-calculator", {"json": calc()}),
+    }
+
+
+def summarize(latencies, errors, elapsed):
+    values = np.asarray(latencies) * 1000
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "p50_ms": round(float(np.percentile(values, 50)), 3) if len(values) else None,
+        "p95_ms": round(float(np.percentile(values, 95)), 3) if len(values) else None,
+        "p99_ms": round(float(np.percentile(values, 99)), 3) if len(values) else None,
+        "mean_ms": round(float(values.mean()), 3) if len(values) else None,
+        "throughput_rps": round(len(latencies) / elapsed, 1) if elapsed else None,
+    }
+
+
+def run_test_client(app_module, targets, n_requests, seed):
+    client = app_module.app.test_client()
+    client.post("/login", data={"username": ADMIN_USERNAME, "password": ADMIN_PASSWORD})
+    results = {}
+    for name, build in scenarios(targets, random.Random(seed)).items():
+        count = min(n_requests, len(targets["pending_ids"])) if name == "approve_loan" else n_requests
+        latencies, errors = [], 0
+        started = time.perf_counter()
+        for i in range(count):
+            method, path, body = build(i)
+            start = time.perf_counter()
+            response = client.open(path, method=method, data=body.get("form"), json=body.get("json"))
+            latencies.append(time.perf_counter() - start)
+            errors += response.status_code >= 400
+        results[name] = summarize(latencies, errors, time.perf_counter() - started)
+    return results
+
+
+def _http_session(port):
+    conn = http.client.HTTPConnection("127.0.0.1", port)
+    conn.request("POST", "/login", body=urlencode({"username": ADMIN_USERNAME, "password": ADMIN_PASSWORD}),
+                 headers={"Content-Type": "application/x-www-form-urlencoded"})
+    response = conn.getresponse()
+    response.read()
+    cookie = response.getheader("Set-Cookie", "").split(";", 1)[0]
+    return conn, cookie
+
+
+def run_http(app_module, targets, n_requests, concurrency, seed):
+    from werkzeug.serving import make_server
+
+    logging.getLogger("werkzeug").setLevel(logging.ERROR)  # per-request access logs skew timings
+    server = make_server("127.0.0.1", 0, app_module.app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    local = threading.local()
+    results = {}
+
+    def send(build, i):
+        if not hasattr(local, "conn"):
+            local.conn, local.cookie = _http_session(server.server_port)
+        method, path, body = build(i)
+        headers = {"Cookie": local.cookie}
+        payload = None
+        if "form" in body:
+            payload = urlencode(body["form"])
+            headers["Content-Type"] = "application/x-www-form-urlencoded"
+        elif "json" in body:
+            payload = json.dumps(body["json"])
+            headers["Content-Type"] = "application/json"
+        start = time.perf_counter()
+        local.conn.request(method, path, body=payload, headers=headers)
+        response = local.conn.getresponse()
+        response.read()
+        return time.perf_counter() - start, response.status >= 400
+
+    try:
+        for name, build in scenarios(targets, random.Random(seed)).items():
+            count = min(n_requests, len(targets["pending_ids"])) if name == "approve_loan" else n_requests
+            started = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=concurrency) as pool:
+                outcomes = list(pool.map(lambda i: send(build, i), range(count)))
+            elapsed = time.perf_counter() - started
+            results[name] = summarize([o[0] for o in outcomes], sum(o[1] for o in outcomes), elapsed)
+            local.__dict__.clear()
+    finally:
+        server.shutdown()
+    return results
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    args = parse_args()
+    if args.reseed:
+        for path in (args.db, args.db + "-wal", args.db + "-shm"):
+            if os.path.exists(path):
+                os.remove(path)
+    fresh = not os.path.exists(args.db)
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.abspath(args.db)}"
+    os.environ.setdefault("EMAIL_DISPATCHER_ENABLED", "false")
+
+    import app as app_module
+
+    with app_module.app.app_context():
+        app_module.upgrade_database()
+
+    portfolio = None
+    if fresh:
+        start = time.perf_counter()
+        portfolio = seed_portfolio(app_module, args.customers, args.loans, args.seed)
+        portfolio["seconds"] = round(time.perf_counter() - start, 1)
+        print(f"Seeded {portfolio} into {args.db}", file=sys.stderr)
+
+    targets = pick_targets(app_module, args.requests, args.seed)
+    if args.mode == "http":
+        results = run_http(app_module, targets, args.requests, args.concurrency, args.seed)
+    else:
+        results = run_test_client(app_module, targets, args.requests, args.seed)
+
+    report = {
+        "revision": git_revision(),
+        "timestamp": datetime.utcnow().isoformat(timespec="seconds"),
+        "mode": args.mode,
+        "concurrency": args.concurrency if args.mode == "http" else 1,
+        "database": args.db,
+        "seeded": portfolio,
+        "scenarios": results,
+    }
+    output = json.dumps(report, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+
+
+if __name__ == "__main__":
+    main()
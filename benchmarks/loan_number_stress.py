@@ -0,0 +1,85 @@
+"""Generate loan numbers from many processes and threads and check they are unique.
+
+Run from the project root:
+
+    python -m benchmarks.loan_number_stress --numbers 100000 --processes 4 --threads 8
+
+Every worker process imports the app on its own and draws numbers through
+generate_loan_number(), sharing only the database. Exits non-zero if any
+number repeats or does not fit Loan.loan_number.
+"""
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--db", default=os.path.join(tempfile.gettempdir(), "loan_number_stress.db"),
+                        help="SQLite file to create (ignored when DATABASE_URL is set).")
+    parser.add_argument("--numbers", type=int, default=100000, help="Total numbers to generate.")
+    parser.add_argument("--processes", type=int, default=4)
+    parser.add_argument("--threads", type=int, default=8, help="Threads per process.")
+    return parser.parse_args()
+
+
+def generate(count, threads):
+    import app as app_module
+
+    def draw(n):
+        with app_module.app.app_context():
+            return [app_module.generate_loan_number() for _ in range(n)]
+
+    shares = [count // threads + (i < count % threads) for i in range(threads)]
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        return [number for chunk in pool.map(draw, shares) for number in chunk]
+
+
+def main():
+    args = parse_args()
+    if "DATABASE_URL" not in os.environ:
+        for path in (args.db, args.db + "-wal", args.db + "-shm"):
+            if os.path.exists(path):
+                os.remove(path)
+        os.environ["DATABASE_URL"] = f"sqlite:///{os.path.abspath(args.db)}"
+    os.environ.setdefault("EMAIL_DISPATCHER_ENABLED", "false")
+
+    import app as app_module
+
+    with app_module.app.app_context():
+        app_module.upgrade_database()
+    max_length = app_module.Loan.__table__.c.loan_number.type.length
+
+    shares = [args.numbers // args.processes + (i < args.numbers % args.processes) for i in range(args.processes)]
+    start = time.perf_counter()
+    with multiprocessing.get_context("spawn").Pool(args.processes) as pool:
+        results = pool.starmap(generate, [(share, args.threads) for share in shares])
+    elapsed = time.perf_counter() - start
+
+    numbers = [number for chunk in results for number in chunk]
+    repeated = [number for number, count in Counter(numbers).items() if count > 1]
+    too_long = [number for number in numbers if len(number) > max_length]
+    print(f"{len(numbers)} loan numbers from {args.processes} processes x {args.threads} threads "
+          f"in {elapsed:.2f}s ({len(numbers) / elapsed:,.0f}/s, block size "
+          f"{app_module.app.config['LOAN_NUMBER_BLOCK_SIZE']}), e.g. {min(numbers)} .. {max(numbers)}")
+    failures = []
+    if len(numbers) != args.numbers:
+        failures.append(f"expected {args.numbers} numbers, got {len(numbers)}")
+    if repeated:
+        failures.append(f"{len(repeated)} numbers handed out more than once, e.g. {repeated[:3]}")
+    if too_long:
+        failures.append(f"{len(too_long)} numbers longer than {max_length} characters, e.g. {too_long[:3]}")
+    for failure in failures:
+        print(f"FAIL {failure}")
+    if failures:
+        sys.exit(1)
+    print("OK: every loan number is unique.")
+
+
+if __name__ == "__main__":
+    main()
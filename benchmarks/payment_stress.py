@@ -0,0 +1,124 @@
+"""Hammer post_payment from many threads and check nothing was lost or doubled.
+
+Run from the project root:
+
+    python -m benchmarks.payment_stress --threads 16 --payments 2000
+
+Every submission is sent twice from different threads with the same
+idempotency key, so the run also checks that retries are replayed rather
+than paid again. Exits non-zero if any invariant fails.
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+import uuid
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--db", default=os.path.join(tempfile.gettempdir(), "payment_stress.db"),
+                        help="SQLite file to create (ignored when DATABASE_URL is set).")
+    parser.add_argument("--loans", type=int, default=50, help="Loans the payments are spread over.")
+    parser.add_argument("--payments", type=int, default=2000, help="Distinct payments to post.")
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--seed", type=int, default=7)
+    return parser.parse_args()
+
+
+def count_transactions(db, Transaction, loan_ids):
+    return db.session.query(db.func.count(Transaction.id)).filter(Transaction.loan_id.in_(list(loan_ids))).scalar()
+
+
+def main():
+    args = parse_args()
+    if "DATABASE_URL" not in os.environ:
+        for path in (args.db, args.db + "-wal", args.db + "-shm"):
+            if os.path.exists(path):
+                os.remove(path)
+        os.environ["DATABASE_URL"] = f"sqlite:///{os.path.abspath(args.db)}"
+    os.environ.setdefault("EMAIL_DISPATCHER_ENABLED", "false")
+
+    import app as app_module
+    from app import Loan, Payment, PaymentSubmission, Transaction, db, post_payment
+
+    rng = random.Random(args.seed)
+    with app_module.app.app_context():
+        app_module.upgrade_database()
+        app_module.seed_synthetic_data(customers=20, loans=args.loans * 8, seed=args.seed)
+        open_counts = dict(db.session.query(Payment.loan_id, db.func.count(Payment.id)).filter(
+            Payment.status.in_(app_module.OPEN_PAYMENT_STATUSES)).group_by(Payment.loan_id))
+        loans = db.session.query(Loan).filter(
+            Loan.status == "active", Loan.id.in_(list(open_counts))).order_by(Loan.id).all()
+        loans = sorted(loans, key=lambda loan: -open_counts[loan.id])[:args.loans]
+        before = {loan.id: (loan.remaining_balance, loan.monthly_payment, loan.customer.user_id) for loan in loans}
+        transactions_before = count_transactions(db, Transaction, before)
+
+    # Plan payments of 1-3 whole installments without exhausting any loan
+    capacity = {loan_id: open_counts[loan_id] for loan_id in before}
+    plan = []
+    while len(plan) < args.payments and any(capacity.values()):
+        loan_id = rng.choice([loan_id for loan_id, left in capacity.items() if left])
+        installments = min(rng.randint(1, 3), capacity[loan_id])
+        capacity[loan_id] -= installments
+        balance, monthly_payment, user_id = before[loan_id]
+        plan.append((loan_id, round(monthly_payment * installments, 2), user_id, uuid.uuid4().hex))
+    submissions = plan + plan  # each key is submitted twice
+    rng.shuffle(submissions)
+
+    results = Counter()
+
+    def submit(item):
+        loan_id, amount, user_id, key = item
+        with app_module.app.app_context():
+            try:
+                _, replayed = post_payment(loan_id, amount, user_id, "online", idempotency_key=key)
+                results["replayed" if replayed else "posted"] += 1
+            except Exception as e:
+                results[f"error: {type(e).__name__}: {e}"] += 1
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.threads) as pool:
+        list(pool.map(submit, submissions))
+    elapsed = time.perf_counter() - start
+
+    failures = []
+    with app_module.app.app_context():
+        posted = defaultdict(float)
+        for loan_id, amount, _, _ in plan:
+            posted[loan_id] += amount
+        rows = db.session.query(PaymentSubmission).filter(PaymentSubmission.loan_id.in_(list(before))).all()
+        if len(rows) != len(plan):
+            failures.append(f"{len(rows)} submissions recorded for {len(plan)} distinct keys")
+        settled = Counter()
+        for row in rows:
+            for number in filter(None, row.installments.split(",")):
+                settled[(row.loan_id, number)] += 1
+        doubled = [key for key, count in settled.items() if count > 1]
+        if doubled:
+            failures.append(f"{len(doubled)} installments settled more than once")
+        for loan in db.session.query(Loan).filter(Loan.id.in_(list(before))):
+            expected = round(before[loan.id][0] - posted[loan.id], 2)
+            if abs(loan.remaining_balance - expected) > 0.01:
+                failures.append(f"loan {loan.id}: balance {loan.remaining_balance:.2f}, expected {expected:.2f}")
+        transactions = count_transactions(db, Transaction, before) - transactions_before
+        if transactions != len(plan):
+            failures.append(f"{transactions} payment transactions for {len(plan)} payments")
+
+    print(f"{len(submissions)} submissions ({len(plan)} distinct) on {len(before)} loans "
+          f"with {args.threads} threads in {elapsed:.2f}s ({len(submissions) / elapsed:,.0f} submissions/s)")
+    for outcome, count in sorted(results.items()):
+        print(f"  {outcome}: {count}")
+    for failure in failures:
+        print(f"FAIL {failure}")
+    if failures or results["posted"] != len(plan):
+        sys.exit(1)
+    print("OK: no lost updates, no double-paid installments, every retry replayed.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Measure loan quotes per second, scalar versus batched pricing.
+
+Run from the project root:
+
+    python -m benchmarks.quote_throughput --quotes 200000
+
+Prices the same random (principal, rate, term) scenarios with a
+calculate_monthly_payment loop, with price_quotes, with a dict memo of the
+scalar function (what a quote cache would cost at best), and through
+batched /api/loan-comparison requests. Exits non-zero if any batched payment
+differs from the scalar one.
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--quotes", type=int, default=200000, help="Scenarios to price.")
+    parser.add_argument("--distinct-principals", type=int, default=2000,
+                        help="Principals are drawn from this many round amounts, as a form would send.")
+    parser.add_argument("--batch", type=int, default=200, help="Scenarios per API request.")
+    parser.add_argument("--seed", type=int, default=7)
+    return parser.parse_args()
+
+
+def timed(label, count, fn):
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<28} {count} quotes in {elapsed:.3f}s ({count / elapsed:,.0f} quotes/s)")
+    return result
+
+
+def main():
+    args = parse_args()
+    os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(tempfile.gettempdir(), 'quote_throughput.db')}")
+    os.environ.setdefault("EMAIL_DISPATCHER_ENABLED", "false")
+
+    import app as app_module
+    from app import LOAN_PRODUCTS, calculate_monthly_payment, price_quotes
+
+    rng = random.Random(args.seed)
+    principals = [1000 * rng.randint(1, 1000) for _ in range(args.distinct_principals)]
+    rates = [product["rate"] for product in LOAN_PRODUCTS] + [0.0, 3.99, 15.5]
+    terms = [12, 24, 36, 48, 60, 120, 240, 360]
+    scenarios = [(rng.choice(principals), rng.choice(rates), rng.choice(terms)) for _ in range(args.quotes)]
+    columns = [list(column) for column in zip(*scenarios)]
+
+    scalar = timed("scalar loop", len(scenarios), lambda: [calculate_monthly_payment(*s) for s in scenarios])
+    batched = timed("price_quotes", len(scenarios), lambda: price_quotes(*columns)[0].tolist())
+    memo = {}
+
+    def memoized():
+        for scenario in scenarios:
+            if scenario not in memo:
+                memo[scenario] = calculate_monthly_payment(*scenario)
+        return [memo[scenario] for scenario in scenarios]
+
+    timed("scalar + memo (cold)", len(scenarios), memoized)
+    timed("scalar + memo (warm)", len(scenarios), memoized)
+    print(f"  memo: {len(memo)} distinct scenarios")
+
+    client = app_module.app.test_client()
+    requests = [
+        {"scenarios": [{"principal": p, "term": t} for p, _, t in scenarios[i:i + args.batch]]}
+        for i in range(0, len(scenarios) // len(LOAN_PRODUCTS), args.batch)
+    ]
+    api_quotes = sum(len(body["scenarios"]) for body in requests) * len(LOAN_PRODUCTS)
+
+    def post_all():
+        for body in requests:
+            response = client.post("/api/loan-comparison", json=body)
+            if response.status_code != 200:
+                raise SystemExit(f"FAIL /api/loan-comparison returned {response.status_code}: {response.get_json()}")
+
+    timed(f"/api/loan-comparison x{args.batch}", api_quotes, post_all)
+
+    mismatched = [(s, a, b) for s, a, b in zip(scenarios, scalar, batched) if a != b]
+    if mismatched:
+        for scenario, expected, got in mismatched[:5]:
+            print(f"FAIL {scenario}: scalar {expected}, batched {got}")
+        print(f"FAIL {len(mismatched)} of {len(scenarios)} batched payments differ from calculate_monthly_payment")
+        sys.exit(1)
+    print("OK: batched payments match calculate_monthly_payment exactly.")
+
+
+if __name__ == "__main__":
+    main()
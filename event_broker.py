@@ -0,0 +1,68 @@
+"""Local pub/sub broker that lets several app processes share live events.
+
+A stand-in for Redis pub/sub during development and load tests. Every app
+process started with EVENT_BROKER_URL=tcp://127.0.0.1:7700 connects here,
+and each line of JSON one process sends is relayed to all of them
+(including the sender), which then deliver it to their own SSE streams.
+
+    python event_broker.py --port 7700
+"""
+import argparse
+import asyncio
+import logging
+
+# A connection whose unsent output grows past this is too slow to keep up
+MAX_BUFFERED_BYTES = 8 * 1024 * 1024
+
+logger = logging.getLogger('loan_management.event_broker')
+
+
+class Broker:
+    def __init__(self):
+        self.clients = set()
+        self.relayed = 0
+
+    async def handle(self, reader, writer):
+        peer = writer.get_extra_info('peername')
+        self.clients.add(writer)
+        logger.info("%s connected (%d processes)", peer, len(self.clients))
+        try:
+            while line := await reader.readline():
+                self.relayed += 1
+                for client in list(self.clients):
+                    if client.transport.get_write_buffer_size() > MAX_BUFFERED_BYTES:
+                        logger.warning("Dropping %s: not reading events", client.get_extra_info('peername'))
+                        self.clients.discard(client)
+                        client.close()
+                        continue
+                    client.write(line)
+        except (ConnectionError, asyncio.LimitOverrunError, ValueError):
+            pass
+        finally:
+            self.clients.discard(writer)
+            writer.close()
+            logger.info("%s disconnected (%d processes)", peer, len(self.clients))
+
+
+async def serve(host, port):
+    broker = Broker()
+    server = await asyncio.start_server(broker.handle, host, port, limit=1024 * 1024)
+    logger.info("Event broker listening on %s:%s", host, port)
+    async with server:
+        await server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=7700)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(message)s')
+    try:
+        asyncio.run(serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
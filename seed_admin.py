@@ -1,11 +1,11 @@
 from werkzeug.security import generate_password_hash
-from app import app, db, User, Customer
+from app import app, db, User, Customer, upgrade_database
 
 
 def ensure_admin_user(username: str, email: str, password: str) -> None:
 	with app.app_context():
-		# Ensure tables exist
-		db.create_all()
+		# Ensure tables exist and are migrated
+		upgrade_database()
 
 		existing = db.session.query(User).filter(
 			(User.username == username) | (User.email == email)
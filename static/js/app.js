@@ -85,7 +85,7 @@ function approveLoan(loanId) {
         makeAjaxRequest(`/api/loan/${loanId}/approve`, 'POST')
             .then(result => {
                 if (result.success) {
-                    location.reload();
+                    updateLoanStatus(loanId, 'approved');
                 }
             })
             .catch(error => {
@@ -99,7 +99,7 @@ function rejectLoan(loanId) {
         makeAjaxRequest(`/api/loan/${loanId}/reject`, 'POST')
             .then(result => {
                 if (result.success) {
-                    location.reload();
+                    updateLoanStatus(loanId, 'rejected');
                 }
             })
             .catch(error => {
@@ -172,13 +172,77 @@ function debounce(func, wait) {
     };
 }
 
-// Search functionality
-function searchLoans(query) {
-    const rows = document.querySelectorAll('#loansTable tbody tr');
-    rows.forEach(row => {
-        const text = row.textContent.toLowerCase();
-        row.style.display = text.includes(query.toLowerCase()) ? '' : 'none';
+// Search functionality (server-side, keyset paginated via /api/loans)
+function loanFilterParams(after) {
+    const params = new URLSearchParams();
+    const query = document.getElementById('searchInput')?.value.trim();
+    const status = document.getElementById('statusFilter')?.value;
+    const type = document.getElementById('typeFilter')?.value;
+    if (query) params.set('q', query);
+    if (status) params.set('status', status);
+    if (type) params.set('type', type);
+    if (after) params.set('after', after);
+    return params;
+}
+
+function loanRow(loan, canManage) {
+    const row = document.createElement('tr');
+    const cells = [
+        loan.loan_number,
+        loan.customer_name,
+        loan.loan_type.charAt(0).toUpperCase() + loan.loan_type.slice(1),
+        '₹' + loan.principal_amount.toFixed(2),
+        loan.interest_rate + '%',
+        loan.loan_term_months + ' months',
+        '₹' + loan.monthly_payment.toFixed(2)
+    ];
+    cells.forEach(text => {
+        row.insertCell().textContent = text;
     });
+
+    const badge = document.createElement('span');
+    const badgeColor = loan.status === 'active' ? 'success' : loan.status === 'pending' ? 'warning' : 'secondary';
+    badge.className = 'badge bg-' + badgeColor;
+    badge.dataset.loanStatus = loan.id;
+    badge.textContent = loan.status.charAt(0).toUpperCase() + loan.status.slice(1);
+    row.insertCell().appendChild(badge);
+
+    const actions = row.insertCell();
+    actions.innerHTML = `<a href="/loan/${loan.id}" class="btn btn-sm btn-info"><i class="fas fa-eye"></i> View</a>`;
+    if (canManage && loan.status === 'pending') {
+        actions.innerHTML += ` <button onclick="approveLoan(${loan.id})" data-loan-action="${loan.id}" class="btn btn-sm btn-success"><i class="fas fa-check"></i> Approve</button>` +
+            ` <button onclick="rejectLoan(${loan.id})" data-loan-action="${loan.id}" class="btn btn-sm btn-danger"><i class="fas fa-times"></i> Reject</button>`;
+    }
+    return row;
+}
+
+async function fetchLoansPage(after) {
+    const table = document.getElementById('loansTable');
+    if (!table) return;
+
+    const result = await makeAjaxRequest('/api/loans?' + loanFilterParams(after).toString());
+    const tbody = table.querySelector('tbody');
+    const canManage = table.dataset.canManage === 'true';
+    if (!after) {
+        tbody.innerHTML = '';
+    }
+    result.loans.forEach(loan => tbody.appendChild(loanRow(loan, canManage)));
+
+    const loadMore = document.getElementById('loadMoreLoans');
+    loadMore.dataset.nextCursor = result.next_cursor || '';
+    loadMore.style.display = result.next_cursor ? '' : 'none';
+    document.getElementById('noLoansMessage').style.display = tbody.rows.length ? 'none' : '';
+}
+
+const searchLoans = debounce(function() {
+    fetchLoansPage(null).catch(error => handleError(error));
+}, 300);
+
+function loadMoreLoans() {
+    const cursor = document.getElementById('loadMoreLoans')?.dataset.nextCursor;
+    if (cursor) {
+        fetchLoansPage(cursor).catch(error => handleError(error));
+    }
 }
 
 // Export to CSV
@@ -233,8 +297,58 @@ function initializeCharts() {
 
 // Real-time notifications (placeholder for future WebSocket integration)
 function initializeNotifications() {
-    // This function can be extended to show real-time notifications
-    console.log('Notifications initialized');
+    // Live notifications and loan status changes pushed by /events
+    const eventsUrl = document.body.dataset.eventsUrl;
+    if (!eventsUrl || !window.EventSource) {
+        return;
+    }
+    const events = new EventSource(eventsUrl);
+    events.addEventListener('notification', event => {
+        const data = JSON.parse(event.data);
+        incrementNotificationBadge();
+        showLiveAlert(data.title, data.message);
+    });
+    events.addEventListener('loan_status', event => {
+        const data = JSON.parse(event.data);
+        updateLoanStatus(data.loan_id, data.status);
+    });
+}
+
+function incrementNotificationBadge() {
+    const badge = document.getElementById('notificationBadge');
+    if (!badge) return;
+    const count = (parseInt(badge.dataset.count) || 0) + 1;
+    badge.dataset.count = count;
+    badge.textContent = count < 100 ? count : '99+';
+    badge.style.display = '';
+}
+
+function showLiveAlert(title, message) {
+    const container = document.querySelector('.container.mt-4');
+    if (!container) return;
+    const alert = document.createElement('div');
+    alert.className = 'alert alert-info alert-dismissible fade show';
+    alert.setAttribute('role', 'alert');
+    const heading = document.createElement('strong');
+    heading.textContent = title + ': ';
+    const close = document.createElement('button');
+    close.type = 'button';
+    close.className = 'btn-close';
+    close.dataset.bsDismiss = 'alert';
+    alert.append(heading, document.createTextNode(message), close);
+    container.prepend(alert);
+}
+
+// Status badges and approve/reject buttons carry data-loan-status / data-loan-action
+function updateLoanStatus(loanId, status) {
+    const colour = status === 'active' ? 'success' : status === 'pending' ? 'warning' : 'secondary';
+    document.querySelectorAll(`[data-loan-status="${loanId}"]`).forEach(badge => {
+        badge.className = `badge bg-${colour}`;
+        badge.textContent = status.charAt(0).toUpperCase() + status.slice(1);
+    });
+    if (status !== 'pending') {
+        document.querySelectorAll(`[data-loan-action="${loanId}"]`).forEach(button => button.remove());
+    }
 }
 
 // Dark mode toggle
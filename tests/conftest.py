@@ -0,0 +1,43 @@
+"""Shared fixtures: the app bound to a throwaway SQLite database with a small seeded portfolio."""
+import os
+import tempfile
+
+import pytest
+from werkzeug.security import generate_password_hash
+
+_DB_DIR = tempfile.mkdtemp(prefix="loan_tests_")
+# app.py reads its configuration at import time
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_DB_DIR, 'loans.db')}"
+os.environ["EMAIL_DISPATCHER_ENABLED"] = "false"
+os.environ["REPORT_CACHE_DIR"] = os.path.join(_DB_DIR, "report_cache")
+
+import app as app_module  # noqa: E402
+from app import User, db  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def loan_app():
+    with app_module.app.app_context():
+        app_module.upgrade_database()
+        app_module.seed_synthetic_data(customers=40, loans=400, seed=3)
+        admin = User(username="test_admin", email="test_admin@example.com", full_name="Test Admin",
+                     password_hash=generate_password_hash("admin123"), role="admin")
+        db.session.add(admin)
+        db.session.commit()
+        app_module.app.config["TEST_ADMIN_ID"] = admin.id
+    yield app_module.app
+
+
+@pytest.fixture
+def app_context(loan_app):
+    with loan_app.app_context():
+        yield
+        db.session.rollback()
+
+
+@pytest.fixture
+def admin_client(loan_app):
+    client = loan_app.test_client()
+    with client.session_transaction() as session:
+        session["user_id"] = loan_app.config["TEST_ADMIN_ID"]
+    return client
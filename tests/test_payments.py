@@ -0,0 +1,107 @@
+"""Idempotent payment posting and unique loan numbers under concurrency."""
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app import (OPEN_PAYMENT_STATUSES, Loan, Payment, PaymentRejected, PaymentSubmission, Transaction, db,
+                 generate_loan_number, post_payment)
+
+_used_loans = set()
+
+
+@pytest.fixture
+def open_loan(app_context):
+    """An active loan with at least two open installments that no other test has paid into."""
+    loan = db.session.query(Loan).filter(
+        Loan.status == 'active', Loan.fees_outstanding == 0, Loan.id.notin_(_used_loans),
+        db.select(db.func.count(Payment.id)).where(
+            Payment.loan_id == Loan.id, Payment.status.in_(OPEN_PAYMENT_STATUSES)).scalar_subquery() >= 2
+    ).order_by(Loan.id).first()
+    _used_loans.add(loan.id)
+    return loan
+
+
+def _next_installment(loan_id):
+    return db.session.query(Payment).filter(
+        Payment.loan_id == loan_id, Payment.status.in_(OPEN_PAYMENT_STATUSES)).order_by(Payment.payment_number).first()
+
+
+def _submissions(key):
+    return db.session.query(PaymentSubmission).filter_by(idempotency_key=key).count()
+
+
+def _payment_transactions(loan_id):
+    return db.session.query(Transaction).filter_by(loan_id=loan_id, transaction_type='payment').count()
+
+
+def test_duplicate_submission_is_replayed(open_loan):
+    loan_id, user_id = open_loan.id, open_loan.customer.user_id
+    balance = open_loan.remaining_balance
+    installment = _next_installment(loan_id)
+    amount, payment_number = installment.amount_due, installment.payment_number
+    transactions_before = _payment_transactions(loan_id)
+    key = uuid.uuid4().hex
+
+    first, replayed = post_payment(loan_id, amount, user_id, idempotency_key=key)
+    assert not replayed
+    second, replayed = post_payment(loan_id, amount, user_id, idempotency_key=key)
+    assert replayed
+    assert second.id == first.id
+
+    assert _submissions(key) == 1
+    assert _payment_transactions(loan_id) == transactions_before + 1
+    assert db.session.get(Loan, loan_id).remaining_balance == pytest.approx(balance - amount, abs=0.01)
+    assert _next_installment(loan_id).payment_number == payment_number + 1
+
+
+def test_reused_key_for_another_amount_is_rejected(open_loan):
+    loan_id, user_id = open_loan.id, open_loan.customer.user_id
+    amount = _next_installment(loan_id).amount_due
+    key = uuid.uuid4().hex
+    post_payment(loan_id, amount, user_id, idempotency_key=key)
+    with pytest.raises(PaymentRejected):
+        post_payment(loan_id, amount + 1, user_id, idempotency_key=key)
+
+
+def test_concurrent_duplicates_post_once(loan_app, open_loan):
+    loan_id, user_id = open_loan.id, open_loan.customer.user_id
+    amount = _next_installment(loan_id).amount_due
+    transactions_before = _payment_transactions(loan_id)
+    key = uuid.uuid4().hex
+    db.session.commit()  # release the read snapshot so the threads can write
+    start = threading.Barrier(8)
+
+    def submit(_):
+        with loan_app.app_context():
+            start.wait()
+            return post_payment(loan_id, amount, user_id, idempotency_key=key)[1]
+
+    with ThreadPoolExecutor(8) as pool:
+        replays = list(pool.map(submit, range(8)))
+    assert replays.count(False) == 1
+    assert _submissions(key) == 1
+    assert _payment_transactions(loan_id) == transactions_before + 1
+
+
+def test_api_replays_with_idempotency_key(admin_client, open_loan):
+    loan_id = open_loan.id
+    amount = _next_installment(loan_id).amount_due
+    headers = {'Idempotency-Key': uuid.uuid4().hex}
+    db.session.commit()
+    first = admin_client.post(f'/api/loan/{loan_id}/payment', json={'amount': amount}, headers=headers)
+    second = admin_client.post(f'/api/loan/{loan_id}/payment', json={'amount': amount}, headers=headers)
+    assert (first.status_code, second.status_code) == (201, 200)
+    assert second.get_json()['id'] == first.get_json()['id']
+    assert second.get_json()['replayed']
+
+
+def test_loan_numbers_are_unique_across_threads(loan_app):
+    def allocate(_):
+        with loan_app.app_context():
+            return [generate_loan_number() for _ in range(200)]
+
+    with ThreadPoolExecutor(8) as pool:
+        numbers = [number for batch in pool.map(allocate, range(8)) for number in batch]
+    assert len(set(numbers)) == len(numbers)
@@ -0,0 +1,46 @@
+"""The listing and detail pages issue a fixed number of queries however many rows they show."""
+import pytest
+
+from app import Customer, Loan, Payment, count_queries, db
+
+LISTING_MAX_QUERIES = 3
+DETAIL_MAX_QUERIES = 7
+
+
+def _queries(loan_app, client, url):
+    with loan_app.app_context(), count_queries() as counter:
+        response = client.get(url)
+    assert response.status_code == 200
+    return counter['count']
+
+
+@pytest.fixture
+def customer_client(loan_app):
+    # The borrower with the most loans, so their listing has several rows
+    with loan_app.app_context():
+        user_id = db.session.query(Customer.user_id).join(Loan, Loan.customer_id == Customer.id).group_by(
+            Customer.user_id).order_by(db.func.count(Loan.id).desc()).limit(1).scalar()
+    client = loan_app.test_client()
+    with client.session_transaction() as session:
+        session['user_id'] = user_id
+    return client
+
+
+@pytest.mark.parametrize('url', ['/loans', '/api/loans'])
+def test_loan_listing_query_count(loan_app, admin_client, customer_client, url):
+    short_page = _queries(loan_app, admin_client, url + '?limit=2')
+    full_page = _queries(loan_app, admin_client, url)
+    assert full_page == short_page
+    assert full_page <= LISTING_MAX_QUERIES
+    assert _queries(loan_app, customer_client, url) <= LISTING_MAX_QUERIES
+
+
+def test_loan_detail_query_count(loan_app, admin_client):
+    with loan_app.app_context():
+        by_size = db.session.query(Payment.loan_id).group_by(Payment.loan_id)
+        smallest = by_size.order_by(db.func.count(Payment.id)).limit(1).scalar()
+        largest = by_size.order_by(db.func.count(Payment.id).desc()).limit(1).scalar()
+    small = _queries(loan_app, admin_client, f'/loan/{smallest}')
+    large = _queries(loan_app, admin_client, f'/loan/{largest}')
+    assert small == large
+    assert large <= DETAIL_MAX_QUERIES
@@ -0,0 +1,12 @@
+"""EXPLAIN QUERY PLAN regression check for the queries behind every page."""
+from app import HOT_QUERIES, Loan, check_query_plans, db
+
+
+def test_hot_queries_use_indexes(app_context):
+    assert check_query_plans() == {}
+
+
+def test_full_scan_is_reported(app_context, monkeypatch):
+    # monthly_payment has no index, so this query can only scan the loan table
+    monkeypatch.setitem(HOT_QUERIES, 'unindexed', lambda: db.session.query(Loan).filter(Loan.monthly_payment == 1))
+    assert list(check_query_plans()) == ['unindexed']